@@ -340,13 +340,15 @@ class PipelineEvaluator:
     ) -> RetrievalResult:
         """Einzelne Query evaluieren."""
         
-        # Retrieval ausführen
+        # Retrieval ausführen (ohne Query-Caches, sonst zahlt nur die erste
+        # Methode pro Query das Embedding und die Latenzen sind nicht vergleichbar)
         start_time = time.time()
         results = await self.vectorstore.search(
             query=query.query,
             top_k=top_k,
             use_hybrid=use_hybrid,
-            use_reranking=use_reranking
+            use_reranking=use_reranking,
+            use_cache=False
         )
         elapsed_ms = (time.time() - start_time) * 1000
         
@@ -75,7 +75,7 @@ async def debug_vectorstore():
 @app.on_event("startup")
 async def startup_event():
     """Lade Demo-Daten beim Start."""
-    from seed_demo import DEMO_FEEDBACKS
+    from seed_demo import load_demo_feedbacks
     from services.deps import get_vectorstore
     
     vs = get_vectorstore()
@@ -83,7 +83,8 @@ async def startup_event():
     
     if count == 0:
         print("🚀 Lade Demo-Daten beim Start...")
-        await vs.add_documents(DEMO_FEEDBACKS)
-        print(f"✅ {len(DEMO_FEEDBACKS)} Demo-Feedbacks geladen!")
+        demo_feedbacks = load_demo_feedbacks()
+        await vs.add_documents(demo_feedbacks)
+        print(f"✅ {len(demo_feedbacks)} Demo-Feedbacks geladen!")
     else:
         print(f"📊 VectorStore enthält bereits {count} Dokumente.")
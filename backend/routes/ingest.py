@@ -68,17 +68,22 @@ async def ingest_feedbacks(request: IngestRequest):
     Unterstützt sowohl das neue Schema (label, style, etc.)
     als auch das alte Schema (source_type, vehicle_model, etc.)
     """
+    if not request.feedbacks:
+        return IngestResponse(success=True, processed=0, pii_result=None, errors=[])
+    
     try:
-        pii_result = None
-        processed_feedbacks = []
+        # PII-Anonymisierung (gebündelt, Ergebnisse gestreamt statt als Liste gehalten)
+        texts = [fb.text for fb in request.feedbacks]
+        if request.anonymize:
+            results = pii_service.anonymize_iter(texts)
+        else:
+            results = ((text, []) for text in texts)
         
-        for fb in request.feedbacks:
-            if request.anonymize:
-                # PII-Anonymisierung
-                anonymized_text, pii_info = pii_service.anonymize(fb.text)
-                fb.text = anonymized_text
-            
-            processed_feedbacks.append(fb)
+        processed_feedbacks = []
+        pii_detected = 0
+        for fb, (anonymized_text, pii_info) in zip(request.feedbacks, results):
+            processed_feedbacks.append({**fb.model_dump(exclude_none=True), "text": anonymized_text})
+            pii_detected += len(pii_info)
         
         # In VectorStore speichern
         await vectorstore.add_documents(processed_feedbacks)
@@ -86,7 +91,11 @@ async def ingest_feedbacks(request: IngestRequest):
         return IngestResponse(
             success=True,
             processed=len(processed_feedbacks),
-            pii_result=pii_result,
+            pii_result=PIIResult(
+                original_count=len(texts),
+                anonymized_count=pii_detected,
+                pii_detected=[]
+            ),
             errors=[]
         )
     except Exception as e:
@@ -123,21 +132,22 @@ async def ingest_stream(
       -H "Content-Type: text/plain" \\
       -d '{"text":"Navigation funktioniert nicht","label":"NAVIGATION"}'
     """
+    import io
     import json
+    import re
     from datetime import datetime
     
     content_type = request.headers.get("content-type", "")
     body = await request.body()
-    body_str = body.decode("utf-8")
     
     feedbacks = []
     errors = []
     
     try:
-        # Versuche als JSON-Array zu parsen
-        if "application/json" in content_type or body_str.strip().startswith("["):
+        # Versuche als JSON-Array zu parsen (json.loads akzeptiert bytes direkt)
+        if "application/json" in content_type or re.match(rb"\s*\[", body):
             try:
-                data = json.loads(body_str)
+                data = json.loads(body)
                 if isinstance(data, list):
                     for i, item in enumerate(data):
                         fb = _parse_feedback_item(item, i)
@@ -150,8 +160,8 @@ async def ingest_stream(
             except json.JSONDecodeError as e:
                 errors.append(f"JSON Parse Error: {str(e)}")
         else:
-            # JSONL-Parsing (eine JSON pro Zeile)
-            for i, line in enumerate(body_str.strip().split('\n')):
+            # JSONL-Parsing (eine JSON pro Zeile, ohne den Body als Liste zu kopieren)
+            for i, line in enumerate(io.BytesIO(body)):
                 if not line.strip():
                     continue
                 try:
@@ -281,14 +291,13 @@ async def upload_file(file: UploadFile = File(...)):
     """
     import csv
     import json
-    from io import StringIO
+    from io import BytesIO, StringIO
     from datetime import datetime
     
     if not file.filename.endswith(('.csv', '.json', '.jsonl')):
         raise HTTPException(status_code=400, detail="Nur CSV/JSON/JSONL erlaubt")
     
     content = await file.read()
-    content_str = content.decode("utf-8")
     
     feedbacks = []
     errors = []
@@ -297,7 +306,7 @@ async def upload_file(file: UploadFile = File(...)):
     try:
         if file.filename.endswith('.jsonl'):
             # JSONL-Parsing (eine JSON pro Zeile) - Optimiert für neuen Datensatz
-            for i, line in enumerate(content_str.strip().split('\n')):
+            for i, line in enumerate(BytesIO(content)):
                 if not line.strip():
                     continue
                 try:
@@ -340,7 +349,7 @@ async def upload_file(file: UploadFile = File(...)):
                         
         elif file.filename.endswith('.json'):
             # JSON-Parsing
-            data = json.loads(content_str)
+            data = json.loads(content)
             if isinstance(data, list):
                 for i, item in enumerate(data):
                     try:
@@ -371,7 +380,7 @@ async def upload_file(file: UploadFile = File(...)):
                             errors.append(f"Zeile {i}: {str(e)}")
         else:
             # CSV-Parsing
-            reader = csv.DictReader(StringIO(content_str))
+            reader = csv.DictReader(StringIO(content.decode("utf-8")))
             for i, row in enumerate(reader):
                 try:
                     # Confidence parsen
@@ -401,6 +410,14 @@ async def upload_file(file: UploadFile = File(...)):
                     if i < 10:
                         errors.append(f"Zeile {i}: {str(e)}")
         
+        if not feedbacks:
+            return {
+                "success": True,
+                "filename": file.filename,
+                "processed": 0,
+                "errors": errors[:10]
+            }
+        
         # PII-Erkennung und Anonymisierung
         processed_feedbacks = []
         for fb in feedbacks:
@@ -525,6 +542,9 @@ async def load_dataset_file(dataset_path: str = "api/dataset.jsonl"):
                     if len(errors) < 10:
                         errors.append(f"Zeile {i}: {str(e)}")
         
+        if not feedbacks:
+            return {"success": True, "processed": 0, "errors": errors}
+        
         # In VectorStore speichern
         await vectorstore.add_documents(feedbacks)
         
@@ -568,14 +588,8 @@ async def clear_and_reload_dataset():
     
     # 1. Alle existierenden Dokumente löschen
     try:
-        existing = vectorstore.collection.get()
-        if existing and existing.get("ids"):
-            old_count = len(existing["ids"])
-            # In Batches löschen (ChromaDB Limit)
-            batch_size = 5000
-            for i in range(0, len(existing["ids"]), batch_size):
-                batch_ids = existing["ids"][i:i + batch_size]
-                vectorstore.collection.delete(ids=batch_ids)
+        old_count = await vectorstore.clear_all()
+        if old_count:
             print(f"🗑️ {old_count} alte Dokumente gelöscht")
     except Exception as e:
         print(f"⚠️ Fehler beim Löschen: {e}")
@@ -67,6 +67,11 @@ def refresh_settings() -> dict:
     """Settings neu laden (nach Änderung)."""
     global _settings_cache
     _settings_cache = load_settings()
+    
+    # Gecachte RAG-Settings verwerfen (Import hier, da services.rag dieses Modul importiert)
+    from services.rag import get_rag_settings
+    get_rag_settings.cache_clear()
+    
     return _settings_cache
 
 
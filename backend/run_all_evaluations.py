@@ -11,7 +11,11 @@ Berechnet Durchschnitte für jede Methode über alle Datasets.
 """
 
 import asyncio
-import json
+import os
+import sys
+from datetime import datetime, timezone
+import numpy as np
+import orjson
 from evaluate_pipeline import (
     PipelineEvaluator,
     VECTOR_QUERIES,
@@ -34,19 +38,24 @@ async def run_all_evaluations():
     print("=" * 70)
     
     evaluator = PipelineEvaluator()
+    dataset_sizes = {name: len(queries) for name, queries in DATASETS.items()}
     all_results = {}
     
-    # Für jedes Dataset evaluieren
+    # Für jedes Dataset evaluieren - bewusst sequentiell, da die Latenzen
+    # (avg_response_time_ms) sonst unter Last gemessen würden
     for dataset_name, queries in DATASETS.items():
-        print(f"\n📊 Evaluiere Dataset: {dataset_name.upper()} ({len(queries)} Queries)")
+        print(f"\n📊 Evaluiere Dataset: {dataset_name.upper()} ({dataset_sizes[dataset_name]} Queries)")
         print("-" * 50)
         
         report = await evaluator.run_full_evaluation(queries=queries, compare_methods=True)
         all_results[dataset_name] = report
         
-        # Kurze Zusammenfassung
-        for method, stats in report["results_by_method"].items():
-            print(f"   {method:20} P={stats['avg_precision']:.1%} R={stats['avg_recall']:.1%} MRR={stats['avg_mrr']:.1%} {stats['avg_response_time_ms']:.0f}ms")
+        # Kurze Zusammenfassung (gepuffert -> ein write())
+        lines = [
+            f"   {method:20} P={stats['avg_precision']:.1%} R={stats['avg_recall']:.1%} MRR={stats['avg_mrr']:.1%} {stats['avg_response_time_ms']:.0f}ms"
+            for method, stats in report["results_by_method"].items()
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # Durchschnitte über alle Datasets berechnen
     print("\n" + "=" * 70)
@@ -54,28 +63,28 @@ async def run_all_evaluations():
     print("=" * 70)
     
     methods = ["vector", "hybrid", "hybrid+rerank"]
-    aggregated = {method: {"precision": [], "recall": [], "mrr": [], "time": []} for method in methods}
     
-    # Sammle Werte pro Methode über alle Datasets
-    for dataset_name, report in all_results.items():
-        for method in methods:
-            if method in report["results_by_method"]:
-                stats = report["results_by_method"][method]
-                aggregated[method]["precision"].append(stats["avg_precision"])
-                aggregated[method]["recall"].append(stats["avg_recall"])
-                aggregated[method]["mrr"].append(stats["avg_mrr"])
-                aggregated[method]["time"].append(stats["avg_response_time_ms"])
-    
-    # Berechne finale Durchschnitte
+    # Berechne finale Durchschnitte (Matrix: Datasets x [Precision, Recall, MRR, Zeit])
     final_averages = {}
     print(f"\n{'Methode':<20} {'Precision':<12} {'Recall':<12} {'MRR':<12} {'Latenz (ms)':<12}")
     print("-" * 70)
     
+    # Werte pro Methode in einem Durchlauf über alle Reports sammeln
+    rows = {method: [] for method in methods}
+    for report in all_results.values():
+        rbm = report["results_by_method"]
+        for method in methods:
+            stats = rbm.get(method)
+            if stats is None:
+                continue
+            rows[method].append([stats["avg_precision"], stats["avg_recall"], stats["avg_mrr"], stats["avg_response_time_ms"]])
+    
     for method in methods:
-        avg_precision = sum(aggregated[method]["precision"]) / len(aggregated[method]["precision"])
-        avg_recall = sum(aggregated[method]["recall"]) / len(aggregated[method]["recall"])
-        avg_mrr = sum(aggregated[method]["mrr"]) / len(aggregated[method]["mrr"])
-        avg_time = sum(aggregated[method]["time"]) / len(aggregated[method]["time"])
+        # Methode in keinem Dataset vorhanden
+        if not rows[method]:
+            continue
+        
+        avg_precision, avg_recall, avg_mrr, avg_time = np.asarray(rows[method], dtype=np.float64).mean(axis=0).tolist()
         
         final_averages[method] = {
             "avg_precision": avg_precision,
@@ -86,32 +95,34 @@ async def run_all_evaluations():
         
         print(f"{method:<20} {avg_precision:<12.1%} {avg_recall:<12.1%} {avg_mrr:<12.1%} {avg_time:<12.0f}")
     
-    # Pro Dataset-Ergebnisse
-    print("\n" + "=" * 70)
-    print("📁 ERGEBNISSE PRO DATASET UND METHODE")
-    print("=" * 70)
-    
-    for dataset_name, report in all_results.items():
-        print(f"\n### {dataset_name.upper()} ({report['total_queries']} Queries)")
-        print(f"{'Methode':<20} {'Precision':<12} {'Recall':<12} {'MRR':<12} {'Latenz':<10}")
-        for method, stats in report["results_by_method"].items():
-            print(f"{method:<20} {stats['avg_precision']:<12.1%} {stats['avg_recall']:<12.1%} {stats['avg_mrr']:<12.1%} {stats['avg_response_time_ms']:<10.0f}ms")
+    # Pro Dataset-Ergebnisse (Wiederholung der Zusammenfassung - nur interaktiv / VERBOSE)
+    if sys.stdout.isatty() or os.environ.get("VERBOSE"):
+        print("\n" + "=" * 70)
+        print("📁 ERGEBNISSE PRO DATASET UND METHODE")
+        print("=" * 70)
+        
+        lines = []
+        for dataset_name, report in all_results.items():
+            lines.append(f"\n### {dataset_name.upper()} ({report['total_queries']} Queries)")
+            lines.append(f"{'Methode':<20} {'Precision':<12} {'Recall':<12} {'MRR':<12} {'Latenz':<10}")
+            for method, stats in report["results_by_method"].items():
+                lines.append(f"{method:<20} {stats['avg_precision']:<12.1%} {stats['avg_recall']:<12.1%} {stats['avg_mrr']:<12.1%} {stats['avg_response_time_ms']:<10.0f}ms")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # Speichern als JSON
     output = {
-        "timestamp": "2026-02-09T08:44:00Z",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
         "datasets_evaluated": list(DATASETS.keys()),
-        "total_queries_per_dataset": {name: len(queries) for name, queries in DATASETS.items()},
+        "total_queries_per_dataset": dataset_sizes,
         "final_averages_across_all_datasets": final_averages,
         "per_dataset_results": {
-            name: {
-                method: stats for method, stats in report["results_by_method"].items()
-            } for name, report in all_results.items()
+            name: report["results_by_method"] for name, report in all_results.items()
         }
     }
     
-    with open("comprehensive_evaluation_report.json", "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    # orjson liefert UTF-8 bytes -> ein einziger write()
+    with open("comprehensive_evaluation_report.json", "wb") as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
     
     print("\n✅ Vollständiger Report gespeichert: comprehensive_evaluation_report.json")
     print("=" * 70)
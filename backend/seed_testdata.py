@@ -9,18 +9,85 @@ Format: JSONL (eine JSON pro Zeile)
 """
 
 import asyncio
-import json
+import mmap
 import os
-from services.vectorstore import VectorStoreService
+from collections import Counter
+from dataclasses import dataclass, asdict
+from itertools import islice
+import orjson
+from services.deps import get_vectorstore
 
 # Pfad zur JSONL-Datei (mit eindeutigen IDs)
 DATASET_PATH = os.path.join(os.path.dirname(__file__), "api", "dataset.jsonl")
 
+# Max. gleichzeitig laufende add_documents-Batches (Embedding-Concurrency)
+MAX_CONCURRENT_BATCHES = 4
 
-def load_jsonl_dataset(filepath: str, limit: int = None) -> list:
+
+@dataclass(slots=True, frozen=True)
+class Feedback:
+    """Ein Feedback im VectorStore-Schema (slots: kein Dict pro Zeile)."""
+    id: str
+    text: str
+    source_type: str
+    language: str
+    timestamp: str
+    vehicle_model: str
+    market: str
+    style: str = ""  # complaint, praise, question etc.
+
+
+def _iter_mmap_lines(mm: mmap.mmap):
+    """
+    (Zeilennummer, Zeile) einer gemappten Datei über Newline-Offsets liefern
+    (ohne Text-Decode, Zeilennummer 1-basiert wie im Editor).
+    
+    Leere bzw. reine Whitespace-Zeilen werden übersprungen - sonst bricht der
+    strict-Modus schon an einer Leerzeile ab.
+    """
+    pos = 0
+    lineno = 0
+    size = len(mm)
+    while pos < size:
+        end = mm.find(b"\n", pos)
+        if end == -1:
+            end = size
+        lineno += 1
+        line = mm[pos:end]
+        if line.strip():
+            yield lineno, line
+        pos = end + 1
+
+
+def _iter_jsonl(lines, strict: bool = True):
+    """
+    JSONL-Zeilen parsen (lines: Iterable von (Zeilennummer, bytes)).
+    
+    strict: Kein try/except pro Zeile - bricht bei der ersten fehlerhaften
+            Zeile ab (für bereinigte Datasets).
+    Sonst:  Fehlerhafte Zeilen werden übersprungen und gemeldet.
+    """
+    if strict:
+        for _, line in lines:
+            yield orjson.loads(line)
+        return
+    
+    for lineno, line in lines:
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            print(f"⚠️  Zeile {lineno} übersprungen: {e}")
+
+
+def load_jsonl_dataset(filepath: str, limit: int = None, strict: bool = True) -> list:
     """
     JSONL-Dataset laden und in VectorStore-Format konvertieren.
     
+    Args:
+        filepath: Pfad zur JSONL-Datei
+        limit: Optional - nur die ersten N Zeilen lesen
+        strict: Bei fehlerhafter Zeile abbrechen statt überspringen
+    
     JSONL-Schema:
     {
         "id": "NAV_0001",
@@ -32,59 +99,56 @@ def load_jsonl_dataset(filepath: str, limit: int = None) -> list:
         ...
     }
     
-    VectorStore-Schema:
+    VectorStore-Schema (als Feedback-Dataclass):
     {
         "id": "...",
         "text": "...",
         "source_type": "navigation",  # label -> lowercase
         "language": "en",              # Standard: en
         "timestamp": "...",            # aus meta.generated_at_utc
-        "vehicle_model": None,
-        "market": None
+        "vehicle_model": "",
+        "market": "",
+        "style": "complaint"           # leer falls nicht vorhanden
     }
     """
     feedbacks = []
     
-    with open(filepath, "r", encoding="utf-8") as f:
-        for i, line in enumerate(f):
-            if limit and i >= limit:
-                break
-                
-            try:
-                item = json.loads(line.strip())
-                
-                # Mapping - IDs sind jetzt eindeutig im neuen Dataset
-                feedback = {
-                    "id": item.get("id"),
-                    "text": item.get("text", ""),
-                    "source_type": item.get("label", "unknown").lower(),
-                    "language": "en",  # Dataset ist englisch
-                    "timestamp": item.get("meta", {}).get("generated_at_utc", ""),
-                    "vehicle_model": "",  # Nicht im Dataset
-                    "market": ""  # Nicht im Dataset
-                }
-                
-                # Style als zusätzliche Info (complaint, praise, question etc.)
-                style = item.get("style", "")
-                if style:
-                    feedback["style"] = style
-                    
-                feedbacks.append(feedback)
-                
-            except json.JSONDecodeError as e:
-                print(f"⚠️  Zeile {i} übersprungen: {e}")
-                continue
+    # Fail-fast bei fehlender Datei; leere Dateien lassen sich nicht mappen
+    if os.stat(filepath).st_size == 0:
+        return feedbacks
+    
+    # Datei memory-mappen - orjson parst die Zeilen-bytes direkt (kein Decode/strip)
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = _iter_mmap_lines(mm)
+        if limit:
+            lines = islice(lines, limit)
+        
+        for item in _iter_jsonl(lines, strict=strict):
+            get = item.get
+            
+            # Mapping - IDs sind jetzt eindeutig im neuen Dataset
+            feedbacks.append(Feedback(
+                id=get("id"),
+                text=get("text", ""),
+                source_type=get("label", "unknown").lower(),
+                language="en",  # Dataset ist englisch
+                timestamp=get("meta", {}).get("generated_at_utc", ""),
+                vehicle_model="",  # Nicht im Dataset
+                market="",  # Nicht im Dataset
+                style=get("style") or ""
+            ))
     
     return feedbacks
 
 
-async def seed_test_data(limit: int = None, force: bool = False):
+async def seed_test_data(limit: int = None, force: bool = False, strict: bool = True):
     """
     Testdaten in VectorStore laden.
     
     Args:
         limit: Optional - Anzahl der Einträge limitieren (für schnelle Tests)
         force: Falls True, vorhandene Daten werden überschrieben
+        strict: Falls False, fehlerhafte JSONL-Zeilen überspringen (--lenient)
     """
     print("🚀 Lade Testdaten aus JSONL...")
     
@@ -92,7 +156,7 @@ async def seed_test_data(limit: int = None, force: bool = False):
         print(f"❌ Dataset nicht gefunden: {DATASET_PATH}")
         return
     
-    vs = VectorStoreService()
+    vs = get_vectorstore()
     
     # Prüfen ob schon Daten vorhanden
     count = await vs.count()
@@ -104,27 +168,36 @@ async def seed_test_data(limit: int = None, force: bool = False):
     
     # Dataset laden
     print(f"📂 Lade Dataset: {DATASET_PATH}")
-    feedbacks = load_jsonl_dataset(DATASET_PATH, limit=limit)
+    feedbacks = load_jsonl_dataset(DATASET_PATH, limit=limit, strict=strict)
     print(f"📊 {len(feedbacks)} Einträge geladen")
     
     # Labels/Kategorien anzeigen
-    labels = {}
-    for fb in feedbacks:
-        label = fb.get("source_type", "unknown")
-        labels[label] = labels.get(label, 0) + 1
+    labels = Counter(fb.source_type for fb in feedbacks)
     
     print("\n📈 Verteilung nach Kategorie:")
-    for label, count in sorted(labels.items(), key=lambda x: -x[1]):
+    for label, count in labels.most_common():
         print(f"   {label}: {count}")
     
     # In VectorStore speichern (in Batches wegen ChromaDB Limit)
     print("\n💾 Speichere in VectorStore...")
     BATCH_SIZE = 5000  # ChromaDB max is 5461
     
-    for i in range(0, len(feedbacks), BATCH_SIZE):
-        batch = feedbacks[i:i + BATCH_SIZE]
-        await vs.add_documents(batch)
-        print(f"   Batch {i // BATCH_SIZE + 1}: {len(batch)} Einträge gespeichert")
+    # Nach Textlänge sortieren: gleich lange Texte pro Batch -> weniger Padding
+    # im Embedding-Modell (IDs reisen mit, Reihenfolge ist egal)
+    feedbacks.sort(key=lambda fb: len(fb.text))
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+    
+    async def add_batch(batch_no: int, batch: list):
+        # Begrenzt parallel: Embedding eines Batches überlappt mit dem Insert des nächsten
+        async with semaphore:
+            # add_documents erwartet Dicts - Konvertierung erst an der Batch-Grenze
+            await vs.add_documents([asdict(fb) for fb in batch])
+        print(f"   Batch {batch_no}: {len(batch)} Einträge gespeichert")
+    
+    await asyncio.gather(*(
+        add_batch(i // BATCH_SIZE + 1, feedbacks[i:i + BATCH_SIZE])
+        for i in range(0, len(feedbacks), BATCH_SIZE)
+    ))
     
     new_count = await vs.count()
     print(f"\n✅ {new_count} Feedbacks geladen!")
@@ -139,11 +212,14 @@ if __name__ == "__main__":
     
     limit = None
     force = False
+    strict = True
     
     # CLI-Argumente parsen
     for arg in sys.argv[1:]:
         if arg == "--force":
             force = True
+        elif arg == "--lenient":
+            strict = False
         elif arg.startswith("--limit="):
             try:
                 limit = int(arg.split("=")[1])
@@ -151,4 +227,4 @@ if __name__ == "__main__":
                 print(f"Ungültiges Limit: {arg}")
                 sys.exit(1)
     
-    asyncio.run(seed_test_data(limit=limit, force=force))
+    asyncio.run(seed_test_data(limit=limit, force=force, strict=strict))
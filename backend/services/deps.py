@@ -4,15 +4,21 @@ Globale VectorStore Instanz (Singleton)
 Stellt sicher, dass alle Komponenten dieselbe VectorStore-Instanz nutzen.
 """
 
+import threading
+
 from services.vectorstore import VectorStoreService
 
 # Globale Instanz
 _vectorstore: VectorStoreService | None = None
+_vectorstore_lock = threading.Lock()
 
 
 def get_vectorstore() -> VectorStoreService:
-    """Gibt die globale VectorStore-Instanz zurück."""
+    """Gibt die globale VectorStore-Instanz zurück (thread-safe)."""
     global _vectorstore
     if _vectorstore is None:
-        _vectorstore = VectorStoreService()
+        # Double-checked Locking: verhindert doppeltes Laden des Embedding-Modells
+        with _vectorstore_lock:
+            if _vectorstore is None:
+                _vectorstore = VectorStoreService()
     return _vectorstore
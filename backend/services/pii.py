@@ -2,7 +2,9 @@
 
 import re
 import hashlib
-from typing import Tuple, List, Dict, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Dict, Optional, Iterator
 
 # Try to import spaCy for NER
 try:
@@ -12,6 +14,78 @@ except ImportError:
     _SPACY_AVAILABLE = False
     spacy = None
 
+# RE2 (google-re2) für linearzeitiges DFA-Matching - optional, Fallback auf re
+try:
+    import re2
+    _RE2_AVAILABLE = True
+except ImportError:
+    _RE2_AVAILABLE = False
+    re2 = None
+
+
+# Regex-Patterns für automotive-spezifische PII
+_RAW_PATTERNS = {
+    "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    "phone_de": r'\b(?:\+49|0049|0)[\s\-]?(?:\d{2,4})[\s\-]?\d{3,8}\b',
+    "plate_de": r'\b[A-ZÄÖÜ]{1,3}[\s\-]?[A-Z]{1,2}[\s\-]?\d{1,4}[EH]?\b',
+    "vin": r'\b[A-HJ-NPR-Z0-9]{17}\b',
+    "date_de": r'\b\d{1,2}\.\d{1,2}\.\d{2,4}\b',
+}
+
+# Bei Überlappung gewinnt der Typ mit höherer Priorität (z.B. "BS 0531 9876543":
+# Telefonnummer statt Kennzeichen "BS 0531" + Rest im Klartext)
+_PII_PRIORITY = ["email", "phone_de", "date_de", "vin", "plate_de"]
+
+# Patterns einmalig kompilieren. Inline-Flag (?i), da RE2 keine re-Flags kennt.
+_PATTERNS = {name: re.compile("(?i)" + _RAW_PATTERNS[name]) for name in _PII_PRIORITY}
+
+# RE2 kennt \b nur für ASCII - bei Umlauten ("ÖHR-AB 12") würde anders gematcht
+# als mit re. Daher RE2 nur für reine ASCII-Texte, dort sind beide identisch.
+_PATTERNS_RE2 = (
+    {name: re2.compile("(?i)" + _RAW_PATTERNS[name]) for name in _PII_PRIORITY}
+    if _RE2_AVAILABLE else None
+)
+
+
+def _find_pii_spans(text: str) -> List[Tuple[int, int, str]]:
+    """
+    Strukturierte PII finden, Überlappungen nach _PII_PRIORITY auflösen.
+    
+    Returns:
+        Liste von (start, end, pii_typ), nach Position sortiert, ohne Überlappungen
+    """
+    patterns = _PATTERNS_RE2 if _PATTERNS_RE2 is not None and text.isascii() else _PATTERNS
+    spans = []
+    
+    for pii_type in _PII_PRIORITY:
+        pattern = patterns[pii_type]
+        pos = 0
+        while True:
+            match = pattern.search(text, pos)
+            if match is None:
+                break
+            start, end = match.start(), match.end()
+            if any(start < s_end and s_start < end for s_start, s_end, _ in spans):
+                # Von höher priorisiertem Treffer belegt - ab nächster Position weitersuchen
+                pos = start + 1
+                continue
+            spans.append((start, end, pii_type))
+            pos = end if end > start else end + 1
+    
+    spans.sort()
+    return spans
+
+# Relevante NER-Labels: Person, Ort, Geo-Political Entity, Organisation
+_NER_KEEP = frozenset({"PER", "LOC", "GPE", "ORG"})
+
+# NER-Vorfilter: Namen/Orte/Firmen brauchen mind. ein großgeschriebenes Wort
+# (inkl. Akronyme wie "VW") - ohne Treffer wird spaCy übersprungen
+_CAP_RE = re.compile(r'[A-ZÄÖÜ][A-Za-zÄÖÜäöüß]+')
+
+# Nur NER wird genutzt - übrige Pipeline-Komponenten gar nicht erst laden
+# (tok2vec bleibt, NER baut darauf auf)
+_SPACY_EXCLUDE = ["tagger", "morphologizer", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
 
 class PIIService:
     """
@@ -27,15 +101,6 @@ class PIIService:
     """
     
     def __init__(self, use_ner: bool = True):
-        # Regex-Patterns für automotive-spezifische PII
-        self.patterns = {
-            "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            "phone_de": r'\b(?:\+49|0049|0)[\s\-]?(?:\d{2,4})[\s\-]?\d{3,8}\b',
-            "plate_de": r'\b[A-ZÄÖÜ]{1,3}[\s\-]?[A-Z]{1,2}[\s\-]?\d{1,4}[EH]?\b',
-            "vin": r'\b[A-HJ-NPR-Z0-9]{17}\b',
-            "date_de": r'\b\d{1,2}\.\d{1,2}\.\d{2,4}\b',
-        }
-        
         # Placeholder für anonymisierte Daten
         self.placeholders = {
             "email": "[EMAIL]",
@@ -51,44 +116,66 @@ class PIIService:
             "ORG": "[FIRMA]",
         }
         
-        # spaCy NER-Modell laden (optional)
-        self.nlp = None
+        # spaCy NER-Modell (optional) wird erst beim ersten Zugriff geladen
         self.use_ner = use_ner
+        self._nlp = None
+        self._nlp_loaded = False
+        self._nlp_lock = threading.Lock()
+    
+    def _get_nlp(self):
+        """spaCy-Modell lazy laden (thread-safe, nur einmal)."""
+        if not self._nlp_loaded:
+            with self._nlp_lock:
+                if not self._nlp_loaded:
+                    self._nlp = self._load_nlp()
+                    self._nlp_loaded = True
+        return self._nlp
+    
+    def _load_nlp(self):
+        """spaCy NER-Modell laden - None falls deaktiviert oder nicht installiert."""
+        if not (self.use_ner and _SPACY_AVAILABLE):
+            return None
+        
+        try:
+            # Versuche deutsches Modell zu laden
+            nlp = spacy.load("de_core_news_sm", exclude=_SPACY_EXCLUDE)
+            print("spaCy NER aktiviert (de_core_news_sm)")
+            return nlp
+        except OSError:
+            pass
         
-        if use_ner and _SPACY_AVAILABLE:
-            try:
-                # Versuche deutsches Modell zu laden
-                self.nlp = spacy.load("de_core_news_sm")
-                print("spaCy NER aktiviert (de_core_news_sm)")
-            except OSError:
-                try:
-                    # Fallback auf englisches Modell
-                    self.nlp = spacy.load("en_core_web_sm")
-                    print("spaCy NER aktiviert (en_core_web_sm)")
-                except OSError:
-                    print("spaCy NER nicht verfügbar - nur Regex-basierte Anonymisierung")
-                    self.nlp = None
+        try:
+            # Fallback auf englisches Modell
+            nlp = spacy.load("en_core_web_sm", exclude=_SPACY_EXCLUDE)
+            print("spaCy NER aktiviert (en_core_web_sm)")
+            return nlp
+        except OSError:
+            print("spaCy NER nicht verfügbar - nur Regex-basierte Anonymisierung")
+            return None
     
     def _ner_anonymize(self, text: str) -> Tuple[str, List[Dict]]:
         """
         NER-basierte Anonymisierung für Namen und Orte.
         Gibt (anonymisierten_text, erkannte_entities) zurück.
         """
-        if not self.nlp:
+        nlp = self._get_nlp()
+        if not nlp or not _CAP_RE.search(text):
             return text, []
         
-        doc = self.nlp(text)
+        return self._ner_anonymize_doc(text, nlp(text))
+    
+    def _ner_anonymize_doc(self, text: str, doc) -> Tuple[str, List[Dict]]:
+        """NER-Anonymisierung auf einem bereits verarbeiteten spaCy-Doc."""
         detected = []
-        anonymized = text
         
-        # Entities in umgekehrter Reihenfolge verarbeiten (um Positionsverschiebungen zu vermeiden)
-        entities = sorted(doc.ents, key=lambda e: e.start_char, reverse=True)
+        # Ein Durchlauf von links nach rechts: Textstücke + Platzhalter sammeln,
+        # am Ende einmal joinen (statt pro Entity den ganzen String neu zu bauen)
+        parts = []
+        cursor = 0
         
-        for ent in entities:
+        for ent in sorted(doc.ents, key=lambda e: e.start_char):
             # Nur PER (Person), LOC (Ort), GPE (Geo-Political Entity), ORG (Organisation)
-            if ent.label_ in ["PER", "LOC", "GPE", "ORG"]:
-                placeholder = self.placeholders.get(ent.label_, "[REDACTED]")
-                
+            if ent.label_ in _NER_KEEP:
                 detected.append({
                     "type": ent.label_,
                     "original_hash": self._hash(ent.text),
@@ -97,10 +184,17 @@ class PIIService:
                     "label": ent.label_
                 })
                 
-                # Ersetze nur diese spezifische Entität
-                anonymized = anonymized[:ent.start_char] + placeholder + anonymized[ent.end_char:]
+                parts.append(text[cursor:ent.start_char])
+                parts.append(self.placeholders.get(ent.label_, "[REDACTED]"))
+                cursor = ent.end_char
         
-        return anonymized, detected
+        if not parts:
+            return text, detected
+        
+        parts.append(text[cursor:])
+        # Reihenfolge von detected wie bisher: letzte Entity zuerst
+        detected.reverse()
+        return "".join(parts), detected
     
     def anonymize(self, text: str) -> Tuple[str, List[Dict]]:
         """
@@ -114,45 +208,113 @@ class PIIService:
         anonymized = text
         
         # 1. Zuerst NER-basierte Anonymisierung (für Namen und Orte)
-        if self.use_ner and self.nlp:
+        if self.use_ner and self._get_nlp():
             anonymized, ner_detected = self._ner_anonymize(anonymized)
             detected_pii.extend(ner_detected)
         
         # 2. Dann Regex-basierte Anonymisierung (für strukturierte PII)
-        for pii_type, pattern in self.patterns.items():
-            matches = re.finditer(pattern, anonymized, re.IGNORECASE)
-            for match in matches:
-                original = match.group()
-                placeholder = self.placeholders.get(pii_type, "[REDACTED]")
-                
-                detected_pii.append({
-                    "type": pii_type,
-                    "original_hash": self._hash(original),
-                    "position": match.start(),
-                    "length": len(original)
-                })
-                
-                anonymized = anonymized.replace(original, placeholder)
+        anonymized = self._regex_anonymize(anonymized, detected_pii)
         
         return anonymized, detected_pii
     
-    def anonymize_batch(self, texts: List[str]) -> List[Tuple[str, List[Dict]]]:
-        """Mehrere Texte anonymisieren."""
-        return [self.anonymize(text) for text in texts]
+    def _regex_anonymize(self, text: str, detected_pii: List[Dict]) -> str:
+        """Strukturierte PII ersetzen (ein Text-Neuaufbau), Treffer an detected_pii anhängen."""
+        spans = _find_pii_spans(text)
+        if not spans:
+            return text
+        
+        parts = []
+        cursor = 0
+        for start, end, pii_type in spans:
+            original = text[start:end]
+            detected_pii.append({
+                "type": pii_type,
+                "original_hash": self._hash(original),
+                "position": start,
+                "length": len(original)
+            })
+            parts.append(text[cursor:start])
+            parts.append(self.placeholders.get(pii_type, "[REDACTED]"))
+            cursor = end
+        
+        parts.append(text[cursor:])
+        return "".join(parts)
+    
+    def anonymize_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        n_process: Optional[int] = None
+    ) -> List[Tuple[str, List[Dict]]]:
+        """
+        Mehrere Texte anonymisieren.
+        
+        NER läuft gebündelt über nlp.pipe() statt einzeln pro Text.
+        
+        Args:
+            batch_size: Texte pro spaCy-Batch bzw. pro Worker-Chunk
+            n_process: Worker-Prozesse (>1 lohnt erst bei großen Batches,
+                       jeder Worker lädt das spaCy-Modell einmal)
+        """
+        return list(self.anonymize_iter(texts, batch_size=batch_size, n_process=n_process))
+    
+    def anonymize_iter(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        n_process: Optional[int] = None
+    ) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Streaming-Variante von anonymize_batch: Ergebnisse werden einzeln
+        geliefert, der Aufrufer kann sie direkt weiterverarbeiten und freigeben.
+        """
+        if n_process and n_process > 1 and len(texts) > batch_size:
+            # Texte sind unabhängig -> Chunks parallel in Worker-Prozessen
+            chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+            with ProcessPoolExecutor(
+                max_workers=n_process,
+                initializer=_init_worker,
+                initargs=(self.use_ner,)
+            ) as executor:
+                for chunk_results in executor.map(_worker_anonymize_chunk, chunks):
+                    yield from chunk_results
+            return
+        
+        nlp = self._get_nlp()
+        if not (self.use_ner and nlp):
+            for text in texts:
+                yield self.anonymize(text)
+            return
+        
+        # Nur Texte mit möglichen NER-Kandidaten durch spaCy schicken
+        needs_ner = [_CAP_RE.search(text) is not None for text in texts]
+        docs = nlp.pipe(
+            (text for text, ner in zip(texts, needs_ner) if ner),
+            batch_size=batch_size
+        )
+        for text, ner in zip(texts, needs_ner):
+            if ner:
+                anonymized, detected_pii = self._ner_anonymize_doc(text, next(docs))
+            else:
+                anonymized, detected_pii = text, []
+            anonymized = self._regex_anonymize(anonymized, detected_pii)
+            yield anonymized, detected_pii
     
     def _hash(self, value: str) -> str:
         """SHA-256 Hash für pseudonymisierung."""
-        return hashlib.sha256(value.encode()).hexdigest()[:16]
+        # Nur die ersten 8 Byte hex-kodieren (identisch zu hexdigest()[:16])
+        return hashlib.sha256(value.encode("utf-8", "ignore")).digest()[:8].hex()
     
     def detect_only(self, text: str) -> List[Dict]:
         """PII erkennen ohne zu anonymisieren (für Preview)."""
         detected = []
         
         # NER-Erkennung
-        if self.use_ner and self.nlp:
-            doc = self.nlp(text)
+        nlp = self._get_nlp()
+        if self.use_ner and nlp and _CAP_RE.search(text):
+            doc = nlp(text)
             for ent in doc.ents:
-                if ent.label_ in ["PER", "LOC", "GPE", "ORG"]:
+                if ent.label_ in _NER_KEEP:
                     detected.append({
                         "type": ent.label_,
                         "start": ent.start_char,
@@ -161,25 +323,42 @@ class PIIService:
                         "source": "ner"
                     })
         
-        # Regex-Erkennung
-        for pii_type, pattern in self.patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                detected.append({
-                    "type": pii_type,
-                    "start": match.start(),
-                    "end": match.end(),
-                    "text": match.group(),
-                    "source": "regex"
-                })
+        # Regex-Erkennung (gleiche Überlappungsauflösung wie anonymize -> Preview == Anonymisierung)
+        for start, end, pii_type in _find_pii_spans(text):
+            detected.append({
+                "type": pii_type,
+                "start": start,
+                "end": end,
+                "text": text[start:end],
+                "source": "regex"
+            })
         
         return detected
     
     def get_status(self) -> Dict:
         """Status des PII-Services zurückgeben."""
+        nlp = self._get_nlp()
         return {
-            "ner_available": self.nlp is not None,
-            "ner_model": self.nlp.meta.get("name") if self.nlp else None,
-            "regex_patterns": list(self.patterns.keys()),
+            "ner_available": nlp is not None,
+            "ner_model": nlp.meta.get("name") if nlp else None,
+            "regex_patterns": list(_RAW_PATTERNS.keys()),
+            "regex_engine": "re2 (ASCII-Texte) + re" if _RE2_AVAILABLE else "re",
             "spacy_installed": _SPACY_AVAILABLE
         }
+
+
+# === Worker für parallele Batch-Anonymisierung ===
+
+# Eine PIIService-Instanz pro Worker-Prozess (Modell wird nur einmal geladen)
+_WORKER_PII: Optional[PIIService] = None
+
+
+def _init_worker(use_ner: bool = True):
+    """ProcessPoolExecutor-Initializer: PIIService im Worker anlegen."""
+    global _WORKER_PII
+    _WORKER_PII = PIIService(use_ner=use_ner)
+
+
+def _worker_anonymize_chunk(texts: List[str]) -> List[Tuple[str, List[Dict]]]:
+    """Einen Chunk im Worker anonymisieren (In-Process-Pfad mit nlp.pipe)."""
+    return _WORKER_PII.anonymize_batch(texts)
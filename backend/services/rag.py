@@ -1,6 +1,8 @@
 """RAG Service - LangChain + OpenAI Integration für Feedback-Analyse."""
 
 import os
+import re
+import functools
 from typing import List, Optional
 from dotenv import load_dotenv
 
@@ -18,14 +20,38 @@ if api_key:
 
 from services.deps import get_vectorstore
 
-# Settings dynamisch laden
+# Settings einmalig importieren (nicht pro Query)
+try:
+    from routes.settings import get_settings
+except ImportError:
+    get_settings = None
+
+
+@functools.lru_cache(maxsize=1)
 def get_rag_settings():
-    """RAG-Settings laden (mit Fallback)."""
-    try:
-        from routes.settings import get_settings
-        return get_settings()
-    except:
-        return {"temperature": 0.3, "citation_required": True, "unanswerable_guard": True}
+    """
+    RAG-Settings laden (mit Fallback).
+    
+    Gecacht - routes.settings.refresh_settings() leert den Cache nach Änderungen.
+    """
+    if get_settings is not None:
+        try:
+            return get_settings()
+        except Exception:
+            pass
+    return {"temperature": 0.3, "citation_required": True, "unanswerable_guard": True}
+
+
+# LLM-Formulierungen für "keine Antwort möglich" - eine Alternation, ein Scan
+_NO_ANSWER_INDICATORS = [
+    "liegt nicht vor", "nicht vor", "not available",
+    "keine relevanten", "no relevant", "cannot answer"
+]
+# IGNORECASE statt answer.lower() -> keine Kopie der Antwort
+_NO_ANSWER_RE = re.compile("|".join(re.escape(s) for s in _NO_ANSWER_INDICATORS), re.IGNORECASE)
+
+# Metadaten-Tags am Textanfang, z.B. "[ID.4] [DE] [voice] [NAVIGATION] "
+_META_PREFIX_RE = re.compile(r'^(\[[^\]]*\]\s*)+')
 
 
 def strip_metadata_prefix(text: str) -> str:
@@ -34,9 +60,8 @@ def strip_metadata_prefix(text: str) -> str:
     Input:  "[ID.4] [DE] [voice] [NAVIGATION] Die Navigation funktioniert nicht"
     Output: "Die Navigation funktioniert nicht"
     """
-    import re
     # Entferne alle [xxx] Tags am Anfang des Textes
-    return re.sub(r'^(\[[^\]]*\]\s*)+', '', text).strip()
+    return _META_PREFIX_RE.sub('', text).strip()
 
 
 class RAGService:
@@ -55,7 +80,7 @@ class RAGService:
     ) -> dict:
         """RAG-Anfrage mit Quellenangabe."""
         
-        # Settings dynamisch laden
+        # Settings laden (gecacht)
         settings = get_rag_settings()
         
         # 1. Retrieval
@@ -107,11 +132,7 @@ class RAGService:
         relevant_sources = [s for s in sources if s.get("score", 0) >= MIN_RELEVANCE_SCORE]
         
         # 6. Wenn LLM sagt "nicht verfügbar", Quellen ausblenden
-        no_answer_indicators = [
-            "liegt nicht vor", "nicht vor", "not available", 
-            "keine relevanten", "no relevant", "cannot answer"
-        ]
-        if any(indicator in answer.lower() for indicator in no_answer_indicators):
+        if _NO_ANSWER_RE.search(answer):
             relevant_sources = []
         
         # 7. Confidence berechnen
@@ -1,10 +1,17 @@
 """VectorStore Service - ChromaDB mit Hybrid Search und Cross-Encoder Reranking."""
 
 from typing import List, Optional, Dict
+import asyncio
+import functools
+import hashlib
+from collections import OrderedDict
+import numpy as np
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
 import os
 import re
+import sys
 
 # BM25 für Keyword-basierte Suche
 try:
@@ -22,30 +29,31 @@ except ImportError:
     CROSS_ENCODER_AVAILABLE = False
     print("sentence-transformers nicht installiert - kein Cross-Encoder Reranking")
 
-# NLTK Stemming
+# Snowball Stemming (PyStemmer, C-Implementierung)
 try:
-    import nltk
-    from nltk.stem import PorterStemmer
-    from nltk.tokenize import word_tokenize
-    # Download required data (silent)
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt', quiet=True)
-    try:
-        nltk.data.find('tokenizers/punkt_tab')
-    except LookupError:
-        nltk.download('punkt_tab', quiet=True)
-    NLTK_AVAILABLE = True
-    stemmer = PorterStemmer()
+    import Stemmer
+    STEMMER_AVAILABLE = True
+    _STEMMER = Stemmer.Stemmer("english")
 except ImportError:
-    NLTK_AVAILABLE = False
-    stemmer = None
-    print("nltk nicht installiert - einfache Tokenisierung")
+    STEMMER_AVAILABLE = False
+    _STEMMER = None
+    print("PyStemmer nicht installiert - Tokenisierung ohne Stemming")
 
+# Kompaktes aber effektives Reranking-Modell; quantisierte ONNX-Variante
+# liegt im Model-Repo (onnx/)
+CROSS_ENCODER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+CROSS_ENCODER_ONNX_FILE = "onnx/model_quint8_avx2.onnx"
 
-# Englische Stopwords (häufigste, für Performance kompakt gehalten)
-STOPWORDS = {
+# Max. Einträge im Cross-Encoder Score-Cache ((query_hash, doc_id, text_hash) -> Score)
+CE_CACHE_SIZE = 50_000
+
+# Tokenizer-Regex einmalig kompilieren (Unicode-Wortzeichen ohne "_",
+# damit Umlaute/ß nicht Wörter zerteilen: "straße" bleibt ein Token)
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+# Englische Stopwords (häufigste, für Performance kompakt gehalten; frozen + interniert)
+STOPWORDS = frozenset(sys.intern(w) for w in {
     "a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "of",
     "with", "by", "from", "as", "is", "was", "are", "were", "been", "be", "have",
     "has", "had", "do", "does", "did", "will", "would", "could", "should", "may",
@@ -55,27 +63,26 @@ STOPWORDS = {
     "some", "such", "no", "not", "only", "same", "so", "than", "too", "very",
     "just", "also", "now", "here", "there", "then", "if", "my", "your", "his",
     "her", "its", "our", "their", "me", "him", "us", "them", "am", "about"
-}
+})
 
 
 def tokenize(text: str) -> List[str]:
-    """Tokenisierung für BM25 mit optionalem NLTK Stemming."""
-    text = text.lower()
+    """Tokenisierung für BM25 mit optionalem Snowball Stemming."""
+    # Stopwords vor dem Stemming entfernen (Stopword-Liste ist ungestemmt)
+    tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
     
-    if NLTK_AVAILABLE:
-        # NLTK Tokenisierung + Stemming
-        try:
-            tokens = word_tokenize(text)
-            tokens = [stemmer.stem(t) for t in tokens if t.isalnum()]
-        except:
-            # Fallback bei NLTK-Fehler
-            tokens = re.findall(r'\b[a-z0-9]+\b', text)
-    else:
-        # Fallback: Regex-basiert
-        tokens = re.findall(r'\b[a-z0-9]+\b', text)
+    if STEMMER_AVAILABLE:
+        # Ein Aufruf für alle Tokens
+        tokens = _STEMMER.stemWords(tokens)
     
-    # Stopwords entfernen und Mindestlänge prüfen
-    return [t for t in tokens if t not in STOPWORDS and len(t) >= 2]
+    # Mindestlänge prüfen
+    return [t for t in tokens if len(t) >= 2]
+
+
+@functools.lru_cache(maxsize=1024)
+def _tokenize_query(text: str) -> tuple:
+    """Query-Tokenisierung gecacht (wiederholte Fragen überspringen Stemming)."""
+    return tuple(tokenize(text))
 
 
 class VectorStoreService:
@@ -88,20 +95,31 @@ class VectorStoreService:
         # ChromaDB mit Persistenz initialisieren
         self.client = chromadb.PersistentClient(path=persist_dir)
         
-        # Collection für Feedback (nutzt default embedding function)
+        # Collection für Feedback (default embedding function, explizit gehalten
+        # damit Query-Embeddings gecacht werden können)
+        self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
         self.collection = self.client.get_or_create_collection(
-            name="feedback"
+            name="feedback",
+            embedding_function=self._embedding_function
         )
         
+        # Query-Embedding Cache (z.B. Evaluation: gleiche Query mit 3 Methoden)
+        self._embed_query = functools.lru_cache(maxsize=4096)(self._compute_query_embedding)
+        
         # BM25-Index Cache
+        # Tokens werden inkrementell gepflegt, BM25Okapi nur aus dem Cache neu gebaut
         self._bm25_index = None
-        self._bm25_docs = []
         self._bm25_ids = []
-        self._bm25_doc_count = 0
+        self._token_cache: Dict[str, List[str]] = {}  # doc_id -> Tokens (Collection-Reihenfolge)
         
         # Cross-Encoder (lazy loading)
         self._cross_encoder = None
         self._cross_encoder_loaded = False
+        self._ce_cache: "OrderedDict[tuple, float]" = OrderedDict()
+    
+    def _compute_query_embedding(self, query: str):
+        """Query einmalig embedden (über _embed_query gecacht)."""
+        return self._embedding_function([query])[0]
     
     def _get_cross_encoder(self):
         """Cross-Encoder lazy laden."""
@@ -110,12 +128,23 @@ class VectorStoreService:
         
         if not self._cross_encoder_loaded:
             try:
-                # Kompaktes aber effektives Modell
-                self._cross_encoder = CrossEncoder('cross-encoder/ms-marco-MiniLM-L-6-v2')
-                print("Cross-Encoder geladen (ms-marco-MiniLM-L-6-v2)")
+                # INT8-quantisiertes ONNX-Modell (onnxruntime, CPU) - braucht
+                # sentence-transformers[onnx]
+                self._cross_encoder = CrossEncoder(
+                    CROSS_ENCODER_MODEL,
+                    backend="onnx",
+                    model_kwargs={"file_name": CROSS_ENCODER_ONNX_FILE}
+                )
+                print("Cross-Encoder geladen (ms-marco-MiniLM-L-6-v2, ONNX INT8)")
             except Exception as e:
-                print(f"Cross-Encoder konnte nicht geladen werden: {e}")
-                self._cross_encoder = None
+                print(f"ONNX Cross-Encoder nicht verfügbar ({e}) - Fallback auf PyTorch")
+                try:
+                    # Fallback: PyTorch FP32
+                    self._cross_encoder = CrossEncoder(CROSS_ENCODER_MODEL)
+                    print("Cross-Encoder geladen (ms-marco-MiniLM-L-6-v2)")
+                except Exception as e:
+                    print(f"Cross-Encoder konnte nicht geladen werden: {e}")
+                    self._cross_encoder = None
             self._cross_encoder_loaded = True
         
         return self._cross_encoder
@@ -155,65 +184,111 @@ class VectorStoreService:
             
             metadatas.append(meta)
         
-        # In ChromaDB speichern
-        self.collection.add(
+        # In ChromaDB speichern (Embedding + Insert blockieren -> Worker-Thread)
+        await asyncio.to_thread(
+            self.collection.add,
             ids=ids,
             documents=texts,
             metadatas=metadatas
         )
         
-        # BM25-Cache invalidieren
+        # BM25 inkrementell: nur die neuen Dokumente tokenisieren
+        # (bereits vorhandene IDs ignoriert ChromaDB beim add)
+        if BM25_AVAILABLE:
+            for doc_id, text in zip(ids, texts):
+                if doc_id not in self._token_cache:
+                    self._token_cache[doc_id] = tokenize(text)
         self._bm25_index = None
         
         return len(documents)
     
-    def _should_rebuild_bm25(self) -> bool:
-        """Prüft ob BM25-Index neu gebaut werden muss."""
-        current_count = self.collection.count()
-        return self._bm25_index is None or current_count != self._bm25_doc_count
+    def _sync_token_cache(self):
+        """
+        Token-Cache vollständig mit der Collection abgleichen.
+        
+        Nur nötig wenn der Cache nicht zur Collection passt (Start mit
+        persistierten Daten, Änderungen aus einem anderen Prozess).
+        """
+        all_docs = self.collection.get(include=["documents"])
+        
+        # Nur neue Dokumente tokenisieren, Rest aus dem Cache
+        old_cache = self._token_cache
+        token_cache = {}
+        for doc_id, doc in zip(all_docs["ids"], all_docs["documents"]):
+            tokens = old_cache.get(doc_id)
+            if tokens is None:
+                tokens = tokenize(doc)
+            token_cache[doc_id] = tokens
+        
+        # Nur aktuelle IDs behalten (gelöschte fallen heraus)
+        self._token_cache = token_cache
+        self._bm25_index = None
     
     def _build_bm25_index(self):
         """
         BM25-Index für Keyword-Suche aufbauen.
         
-        Mit NLTK Stemming für besseren Recall.
+        Mit Snowball Stemming für besseren Recall. Der Index wird aus den
+        gecachten Tokens gebaut (nur IDF/Längen-Statistik, kein Re-Tokenisieren).
         """
         if not BM25_AVAILABLE:
             return
         
-        if not self._should_rebuild_bm25():
-            return
-        
-        all_docs = self.collection.get(include=["documents"])
+        if self.collection.count() != len(self._token_cache):
+            self._sync_token_cache()
         
-        if not all_docs["ids"]:
+        if self._bm25_index is not None or not self._token_cache:
             return
         
-        self._bm25_ids = all_docs["ids"]
-        self._bm25_docs = all_docs["documents"]
-        self._bm25_doc_count = len(self._bm25_ids)
-        
-        # Tokenisierung mit Stemming
-        tokenized = [tokenize(doc) for doc in self._bm25_docs]
-        self._bm25_index = BM25Okapi(tokenized)
+        self._bm25_ids = list(self._token_cache)
+        self._bm25_index = BM25Okapi(list(self._token_cache.values()))
     
-    def _cross_encoder_rerank(self, query: str, candidates: List[Dict], top_k: int) -> List[Dict]:
+    def _cross_encoder_rerank(
+        self,
+        query: str,
+        candidates: List[Dict],
+        top_k: int,
+        use_cache: bool = True
+    ) -> List[Dict]:
         """Cross-Encoder Reranking für höhere Retrieval-Qualität."""
         cross_encoder = self._get_cross_encoder()
         
         if not cross_encoder or len(candidates) == 0:
             return candidates[:top_k]
         
-        # Query-Document Paare erstellen
-        pairs = [(query, c["text"]) for c in candidates]
+        # Gecachte Scores übernehmen, nur für fehlende Paare predict() aufrufen
+        qhash = hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+        cache = self._ce_cache
+        misses = []
+        for candidate in candidates:
+            # Text-Digest im Key: andere VectorStoreService-Instanzen können die
+            # Collection mit gleichen IDs, aber neuen Texten neu geladen haben
+            text_hash = hashlib.blake2b(candidate["text"].encode(), digest_size=8).hexdigest()
+            key = (qhash, candidate["id"], text_hash)
+            score = cache.get(key) if use_cache else None
+            if score is None:
+                misses.append((candidate, key))
+            else:
+                cache.move_to_end(key)
+                candidate["cross_encoder_score"] = score
         
         # Cross-Encoder Scores berechnen
         try:
-            scores = cross_encoder.predict(pairs)
-            
-            # Scores zu Kandidaten hinzufügen
-            for i, candidate in enumerate(candidates):
-                candidate["cross_encoder_score"] = float(scores[i])
+            if misses:
+                # Query-Document Paare erstellen
+                pairs = [(query, c["text"]) for c, _ in misses]
+                scores = cross_encoder.predict(pairs)
+                
+                # Scores zu Kandidaten hinzufügen und cachen
+                for (candidate, key), score in zip(misses, scores):
+                    score = float(score)
+                    candidate["cross_encoder_score"] = score
+                    if use_cache:
+                        cache[key] = score
+                
+                # LRU: älteste Einträge verwerfen
+                while len(cache) > CE_CACHE_SIZE:
+                    cache.popitem(last=False)
             
             # Nach Cross-Encoder Score sortieren
             reranked = sorted(candidates, key=lambda x: x.get("cross_encoder_score", 0), reverse=True)
@@ -230,9 +305,16 @@ class VectorStoreService:
         top_k: int = 10,
         use_hybrid: bool = True,
         use_reranking: bool = True,  # NEU: Cross-Encoder Reranking
-        filters: Optional[dict] = None
+        filters: Optional[dict] = None,
+        use_cache: bool = True
     ) -> List[Dict]:
-        """Hybrid Search mit BM25 + Vector und optionalem Cross-Encoder Reranking."""
+        """
+        Hybrid Search mit BM25 + Vector und optionalem Cross-Encoder Reranking.
+        
+        use_cache=False umgeht die Query-Caches (z.B. für Latenzmessungen in der Evaluation).
+        """
+        embed = self._embed_query if use_cache else self._compute_query_embedding
+        
         # Where-Filter aufbauen
         where_filter = None
         if filters:
@@ -241,7 +323,7 @@ class VectorStoreService:
         # === VECTOR SEARCH ===
         try:
             vector_results = self.collection.query(
-                query_texts=[query],
+                query_embeddings=[embed(query)],
                 n_results=top_k * 3,
                 where=where_filter if where_filter else None,
                 include=["documents", "metadatas", "distances"]
@@ -265,15 +347,21 @@ class VectorStoreService:
             self._build_bm25_index()
             
             if self._bm25_index:
-                tokenized_query = tokenize(query)
+                tokenized_query = _tokenize_query(query)
                 
                 if tokenized_query:
                     bm25_scores = self._bm25_index.get_scores(tokenized_query)
-                    scored_docs = sorted(zip(self._bm25_ids, bm25_scores), key=lambda x: x[1], reverse=True)
                     
-                    for rank, (doc_id, score) in enumerate(scored_docs[:top_k * 3]):
-                        if score > 0:
-                            bm25_rankings[doc_id] = {"rank": rank + 1, "score": score}
+                    # Top-k per argpartition (O(N)), nur diese k Einträge sortieren
+                    n = min(top_k * 3, len(bm25_scores))
+                    if n > 0:
+                        top_idx = np.argpartition(-bm25_scores, n - 1)[:n]
+                        top_idx = top_idx[np.argsort(-bm25_scores[top_idx], kind="stable")]
+                        
+                        for rank, idx in enumerate(top_idx):
+                            score = bm25_scores[idx]
+                            if score > 0:
+                                bm25_rankings[self._bm25_ids[idx]] = {"rank": rank + 1, "score": score}
         
         # === RRF FUSION ===
         k = 60
@@ -301,9 +389,24 @@ class VectorStoreService:
         
         sorted_ids = sorted(rrf_scores.keys(), key=lambda x: rrf_scores[x], reverse=True)
         
+        # BM25-only Treffer (nicht in der Vector-Suche) mit einem einzigen get() nachladen
+        fused_ids = sorted_ids[:top_k * 2]  # Mehr für Reranking
+        missing = [doc_id for doc_id in fused_ids if doc_id not in vector_rankings and doc_id in bm25_rankings]
+        bm25_only_docs = None
+        if missing:
+            try:
+                batch = self.collection.get(ids=missing, include=["documents", "metadatas"])
+                metadatas = batch.get("metadatas") or [{}] * len(batch["ids"])
+                bm25_only_docs = {
+                    doc_id: (doc, meta)
+                    for doc_id, doc, meta in zip(batch["ids"], batch["documents"], metadatas)
+                }
+            except Exception:
+                bm25_only_docs = None
+        
         # Kandidaten für Reranking vorbereiten
         candidates = []
-        for doc_id in sorted_ids[:top_k * 2]:  # Mehr für Reranking
+        for doc_id in fused_ids:
             info = vector_rankings.get(doc_id)
             if info:
                 method = "hybrid" if doc_id in bm25_rankings else "vector"
@@ -315,23 +418,20 @@ class VectorStoreService:
                     "retrieval_method": method,
                     "vector_distance": info["distance"]
                 })
-            elif doc_id in bm25_rankings:
-                try:
-                    doc_data = self.collection.get(ids=[doc_id], include=["documents", "metadatas"])
-                    candidates.append({
-                        "id": doc_id,
-                        "text": doc_data["documents"][0] if doc_data["documents"] else "",
-                        "score": rrf_scores[doc_id],
-                        "metadata": doc_data["metadatas"][0] if doc_data.get("metadatas") else {},
-                        "retrieval_method": "bm25",
-                        "vector_distance": None
-                    })
-                except:
-                    pass
+            elif doc_id in bm25_rankings and bm25_only_docs is not None:
+                text, metadata = bm25_only_docs.get(doc_id, ("", {}))
+                candidates.append({
+                    "id": doc_id,
+                    "text": text,
+                    "score": rrf_scores[doc_id],
+                    "metadata": metadata,
+                    "retrieval_method": "bm25",
+                    "vector_distance": None
+                })
         
         # === CROSS-ENCODER RERANKING ===
         if use_reranking and CROSS_ENCODER_AVAILABLE:
-            candidates = self._cross_encoder_rerank(query, candidates, top_k)
+            candidates = self._cross_encoder_rerank(query, candidates, top_k, use_cache=use_cache)
         else:
             candidates = candidates[:top_k]
         
@@ -345,4 +445,30 @@ class VectorStoreService:
         """Dokumente löschen."""
         self.collection.delete(ids=ids)
         self._bm25_index = None
+        for doc_id in ids:
+            self._token_cache.pop(doc_id, None)
+        
+        # Gecachte Rerank-Scores der gelöschten Dokumente verwerfen
+        deleted = set(ids)
+        for key in [key for key in self._ce_cache if key[1] in deleted]:
+            del self._ce_cache[key]
+        return len(ids)
+    
+    async def clear_all(self, batch_size: int = 5000) -> int:
+        """
+        Alle Dokumente löschen.
+        
+        ChromaDB-Aufrufe sind blockierend und laufen daher in einem
+        Worker-Thread, damit der Event-Loop weiter Requests bedienen kann.
+        """
+        existing = await asyncio.to_thread(self.collection.get, include=[])
+        ids = existing.get("ids") or []
+        
+        # In Batches löschen (ChromaDB Limit)
+        for i in range(0, len(ids), batch_size):
+            await asyncio.to_thread(self.collection.delete, ids=ids[i:i + batch_size])
+        
+        self._bm25_index = None
+        self._token_cache = {}
+        self._ce_cache.clear()
         return len(ids)